@@ -1,7 +1,6 @@
 # pipelines/eval/run_eval.py
 from __future__ import annotations
 from pathlib import Path
-import json
 import sys
 import math
 
@@ -10,6 +9,10 @@ sys.path.append(str(Path(__file__).resolve().parents[2] / "src"))
 from research_reco.config import load_paths, load_settings
 from research_reco.bm25 import BM25Index, bm25_search
 from research_reco.text_utils import load_stopwords, preprocess_text
+from research_reco.io_utils import iter_jsonl
+
+# log2(i + 1) untuk posisi 1..100 (indeks 0 tidak dipakai)
+_LOG2 = [0.0] + [math.log2(i + 1) for i in range(1, 101)]
 
 
 def precision_at_k(ranked, relevant, k):
@@ -29,19 +32,24 @@ def mrr_at_k(ranked, relevant, k):
     return 0.0
 
 
-def ndcg_at_k(ranked, rel_map, k):
+def ideal_order(rel_map):
+    """doc_id urut relevansi menurun; cukup dihitung sekali per query."""
+    return [d for d, _ in sorted(rel_map.items(), key=lambda x: x[1], reverse=True)]
+
+
+def ndcg_at_k(ranked, rel_map, k, ideal_ranked=None):
     def dcg(items):
         s = 0.0
         for i, d in enumerate(items, start=1):
             rel = float(rel_map.get(d, 0.0))
             if rel > 0:
-                s += (2 ** rel - 1) / (math.log2(i + 1))
+                s += (2 ** rel - 1) / (_LOG2[i] if i < len(_LOG2) else math.log2(i + 1))
         return s
 
     dcg_val = dcg(ranked[:k])
-    ideal = sorted(rel_map.items(), key=lambda x: x[1], reverse=True)
-    ideal_ranked = [d for d, _ in ideal][:k]
-    idcg = dcg(ideal_ranked)
+    if ideal_ranked is None:
+        ideal_ranked = ideal_order(rel_map)
+    idcg = dcg(ideal_ranked[:k])
     return 0.0 if idcg == 0 else dcg_val / idcg
 
 
@@ -71,19 +79,18 @@ def main():
         use_domain=settings.use_domain_stopwords,
     )
 
-    rows = [json.loads(x) for x in eval_file.read_text(encoding="utf-8").splitlines() if x.strip()]
-    if not rows:
-        raise RuntimeError("eval/queries.jsonl kosong.")
-
     ks = [5, 10]
     agg = {f"P@{k}": 0.0 for k in ks}
     agg.update({f"MRR@{k}": 0.0 for k in ks})
     agg.update({f"nDCG@{k}": 0.0 for k in ks})
 
     n = 0
+    n_rows = 0
     debug_shown = 0
 
-    for r in rows:
+    # stream baris query satu per satu (file tidak dibaca utuh ke memori)
+    for r in iter_jsonl(eval_file):
+        n_rows += 1
         q = str(r.get("query", "")).strip()
         if not q:
             continue
@@ -122,13 +129,17 @@ def main():
                 print("First result keys:", list(res[0].keys()))
             print("----")
 
+        ideal_ranked = ideal_order(rel_map) if rel_map else None
+
         for k in ks:
             agg[f"P@{k}"] += precision_at_k(ranked_doc_ids, relevant, k) if relevant else 0.0
             agg[f"MRR@{k}"] += mrr_at_k(ranked_doc_ids, relevant, k) if relevant else 0.0
-            agg[f"nDCG@{k}"] += ndcg_at_k(ranked_doc_ids, rel_map, k) if rel_map else 0.0
+            agg[f"nDCG@{k}"] += ndcg_at_k(ranked_doc_ids, rel_map, k, ideal_ranked) if rel_map else 0.0
 
         n += 1
 
+    if n_rows == 0:
+        raise RuntimeError("eval/queries.jsonl kosong.")
     if n == 0:
         raise RuntimeError("Tidak ada query valid di eval/queries.jsonl")
 
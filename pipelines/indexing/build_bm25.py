@@ -7,6 +7,9 @@ from research_reco.config import load_paths
 from research_reco.io_utils import read_jsonl
 from research_reco.bm25 import build_bm25_index
 
+# fields copied from each processed doc into BM25 docs_meta
+_META_KEYS = ("doc_id", "source", "dosen", "judul", "keyword", "tanggal", "url", "peneliti")
+
 
 def main():
     paths = load_paths()
@@ -14,17 +17,9 @@ def main():
     if not docs:
         raise RuntimeError("docs.jsonl kosong. Jalankan preprocess dulu.")
 
-    tokens = [d.get("tokens", []) for d in docs]
-    meta = [{
-        "doc_id": d.get("doc_id"),
-        "source": d.get("source"),
-        "dosen": d.get("dosen"),
-        "judul": d.get("judul"),
-        "keyword": d.get("keyword"),
-        "tanggal": d.get("tanggal"),
-        "url": d.get("url"),
-        "peneliti": d.get("peneliti"),
-    } for d in docs]
+    # intern: one str object per term across docs (less RAM, dict lookups hit on identity)
+    tokens = [[sys.intern(t) for t in d.get("tokens", [])] for d in docs]
+    meta = [{k: d.get(k) for k in _META_KEYS} for d in docs]
 
     index = build_bm25_index(tokens, meta)
     index.save(paths.bm25_index_file)
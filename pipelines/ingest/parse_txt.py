@@ -15,12 +15,8 @@ def main():
     files = collect_txt_files(raw_root)
     print(f"[ingest] found {len(files)} txt files under {raw_root}")
 
-    parsed = []
-    for fp in files:
-        doc = parse_txt_file(fp)
-        parsed.append(doc.to_dict())
-
-    write_jsonl(paths.parsed_jsonl, parsed)
+    # streamed: tiap file di-parse lalu langsung ditulis, tanpa list semua dokumen di memori
+    write_jsonl(paths.parsed_jsonl, (parse_txt_file(fp).to_dict() for fp in files))
     print(f"[ingest] wrote: {paths.parsed_jsonl}")
 
 
@@ -9,8 +9,9 @@ sys.path.append(str(Path(__file__).resolve().parents[2] / "src"))
 from research_reco.config import load_paths
 from research_reco.io_utils import read_jsonl
 
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
 
 def main():
     paths = load_paths()
@@ -22,11 +23,12 @@ def main():
     texts = [" ".join(d.get("tokens", [])) for d in docs]
     doc_ids = [d.get("doc_id") for d in docs]
 
-    vectorizer = TfidfVectorizer(max_features=20000, min_df=2)
+    # float32: setengah memori/bandwidth buat hitung jarak, presisi tetap cukup buat clustering
+    vectorizer = TfidfVectorizer(max_features=20000, min_df=2, dtype=np.float32)
     X = vectorizer.fit_transform(texts)
 
     n_clusters = 8  # bisa lo ubah
-    km = KMeans(n_clusters=n_clusters, random_state=42, n_init="auto")
+    km = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=3, batch_size=1024, max_iter=100)
     labels = km.fit_predict(X)
 
     terms = vectorizer.get_feature_names_out()
@@ -34,8 +36,10 @@ def main():
 
     topics = []
     for c in range(n_clusters):
-        # top terms cluster
-        idxs = centers[c].argsort()[::-1][:15]
+        # top terms cluster (partial sort: argpartition lalu urutkan 15 teratas saja)
+        k = min(15, len(terms))
+        top = np.argpartition(centers[c], -k)[-k:]
+        idxs = top[np.argsort(centers[c][top])[::-1]]
         top_terms = [terms[i] for i in idxs]
 
         members = [doc_ids[i] for i, lab in enumerate(labels) if lab == c][:30]
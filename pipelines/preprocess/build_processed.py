@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
+from multiprocessing import Pool
+from typing import Any, Dict, Tuple
+import os
 import sys
 import argparse
 
@@ -8,8 +13,8 @@ import argparse
 sys.path.append(str(Path(__file__).resolve().parents[2] / "src"))
 
 from research_reco.config import load_paths, load_settings
-from research_reco.io_utils import read_jsonl, write_jsonl
-from research_reco.text_utils import load_stopwords, preprocess_text
+from research_reco.io_utils import iter_jsonl, write_jsonl
+from research_reco.text_utils import load_stopwords, preprocess_text, stem_cache_info
 
 # Import build_text_for_index always; boosted is optional (fallback if missing)
 from research_reco.text_utils import build_text_for_index
@@ -21,6 +26,80 @@ except Exception:
     build_boosted_text_for_index = None  # type: ignore
 
 
+# worker pool cuma dipakai kalau corpus cukup besar: tiap worker bikin ulang stemmer Sastrawi,
+# jadi untuk corpus kecil (~200 dokumen) proses serial lebih cepat
+_POOL_MIN_ROWS = 1000
+_DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+# per-process config for _process_row (set once per worker via Pool initializer)
+_CFG: Dict[str, Any] = {}
+
+
+def _init_worker(cfg: Dict[str, Any]) -> None:
+    _CFG.clear()
+    _CFG.update(cfg)
+    _tokens_for_text.cache_clear()
+
+
+@lru_cache(maxsize=200_000)
+def _tokens_for_text(text_for_index: str) -> Tuple[str, ...]:
+    # text identik (mis. publikasi yang sama di dua sumber) cukup diproses sekali per process;
+    # stopwords/stem_mode tetap per process (_CFG), jadi cukup key di text
+    return tuple(preprocess_text(
+        text_for_index,
+        stopwords=_CFG["stopwords"],
+        stem_mode=_CFG["stem_mode"],
+    ))
+
+
+def _process_row(r: Dict[str, Any]) -> Dict[str, Any]:
+    judul = r.get("judul")
+    keyword = r.get("keyword")
+    abstrak = r.get("abstrak")
+
+    # Build text_for_index with optional field boosting
+    if _CFG["use_boost"]:
+        text_for_index = build_boosted_text_for_index(
+            judul,
+            keyword,
+            abstrak,
+            title_boost=_CFG["title_boost"],
+            keyword_boost=_CFG["keyword_boost"],
+            abstract_boost=_CFG["abstract_boost"],
+        )
+    else:
+        text_for_index = build_text_for_index(judul, keyword, abstrak)
+
+    use_boost = _CFG["use_boost"]
+    return {
+        "doc_id": r.get("doc_id"),
+        "source": r.get("source"),
+        "dosen": r.get("dosen"),
+        "url": r.get("url"),
+        "tanggal": r.get("tanggal"),
+        "judul": judul,
+        "keyword": keyword,
+        "abstrak": abstrak,
+        "peneliti": r.get("peneliti"),
+        "text_for_index": text_for_index,
+        "tokens": list(_tokens_for_text(text_for_index)),
+
+        # Save preprocessing config so API stays consistent
+        "stemming_mode": _CFG["stem_mode"],
+        "use_sastrawi_stopwords": _CFG["use_sastrawi_stopwords"],
+        "use_domain_stopwords": _CFG["use_domain_stopwords"],
+
+        # Save boosting config (so you can prove it in evaluation/report)
+        "field_boosting": {
+            "enabled": bool(use_boost),
+            "title_boost": int(_CFG["title_boost"]) if use_boost else 1,
+            "keyword_boost": int(_CFG["keyword_boost"]) if use_boost else 1,
+            "abstract_boost": int(_CFG["abstract_boost"]) if use_boost else 1,
+        },
+    }
+
+
 def main():
     ap = argparse.ArgumentParser(description="Build processed docs (tokens) from parsed_docs.jsonl")
 
@@ -39,6 +118,15 @@ def main():
     ap.add_argument("--title_boost", type=int, default=2, help="Repetition factor for judul (default=2)")
     ap.add_argument("--keyword_boost", type=int, default=3, help="Repetition factor for keyword (default=3)")
     ap.add_argument("--abstract_boost", type=int, default=1, help="Repetition factor for abstrak (default=1)")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=_DEFAULT_WORKERS,
+        help=(
+            f"Processes for preprocessing (default=min(4, cpu count), 1 = no multiprocessing); "
+            f"the pool is only used for >= {_POOL_MIN_ROWS} rows"
+        ),
+    )
 
     args = ap.parse_args()
 
@@ -59,74 +147,54 @@ def main():
         use_domain=settings.use_domain_stopwords,
     )
 
-    rows = read_jsonl(paths.parsed_jsonl)
-    if not rows:
+    # streamed: baris dibaca, diproses, dan ditulis bertahap (peak memory ~ satu batch, bukan seluruh corpus)
+    rows = iter_jsonl(paths.parsed_jsonl)
+    # intip baris awal: kosong -> error, kurang dari _POOL_MIN_ROWS -> nggak perlu pool
+    head = list(islice(rows, _POOL_MIN_ROWS))
+    if not head:
         raise RuntimeError("parsed_docs.jsonl kosong. Jalankan pipelines/ingest/parse_txt.py dulu.")
+    rows = chain(head, rows)
 
     use_boost = (args.boost == "on") and (build_boosted_text_for_index is not None)
 
-    out = []
-    for r in rows:
-        judul = r.get("judul")
-        keyword = r.get("keyword")
-        abstrak = r.get("abstrak")
-
-        # Build text_for_index with optional field boosting
-        if use_boost:
-            text_for_index = build_boosted_text_for_index(  
-                judul,
-                keyword,
-                abstrak,
-                title_boost=args.title_boost,
-                keyword_boost=args.keyword_boost,
-                abstract_boost=args.abstract_boost,
-            )
-        else:
-            text_for_index = build_text_for_index(judul, keyword, abstrak)
-
-        tokens = preprocess_text(
-            text_for_index,
-            stopwords=stopwords,
-            stem_mode=stem_mode,
-        )
-
-        out.append(
-            {
-                "doc_id": r.get("doc_id"),
-                "source": r.get("source"),
-                "dosen": r.get("dosen"),
-                "url": r.get("url"),
-                "tanggal": r.get("tanggal"),
-                "judul": judul,
-                "keyword": keyword,
-                "abstrak": abstrak,
-                "peneliti": r.get("peneliti"),
-                "text_for_index": text_for_index,
-                "tokens": tokens,
-
-                # Save preprocessing config so API stays consistent
-                "stemming_mode": stem_mode,
-                "use_sastrawi_stopwords": bool(settings.use_sastrawi_stopwords),
-                "use_domain_stopwords": bool(settings.use_domain_stopwords),
-
-                # Save boosting config (so you can prove it in evaluation/report)
-                "field_boosting": {
-                    "enabled": bool(use_boost),
-                    "title_boost": int(args.title_boost) if use_boost else 1,
-                    "keyword_boost": int(args.keyword_boost) if use_boost else 1,
-                    "abstract_boost": int(args.abstract_boost) if use_boost else 1,
-                },
-            }
-        )
+    cfg = {
+        "stopwords": stopwords,
+        "stem_mode": stem_mode,
+        "use_boost": use_boost,
+        "title_boost": args.title_boost,
+        "keyword_boost": args.keyword_boost,
+        "abstract_boost": args.abstract_boost,
+        "use_sastrawi_stopwords": bool(settings.use_sastrawi_stopwords),
+        "use_domain_stopwords": bool(settings.use_domain_stopwords),
+    }
+
+    # preprocessing per dokumen independen -> paralel; imap menjaga urutan (doc_idx BM25 ikut urutan ini)
+    workers = max(1, int(args.workers))
+    use_pool = workers > 1 and len(head) >= _POOL_MIN_ROWS
+    if use_pool:
+        # with-block: kalau write_jsonl / worker raise, pool di-terminate (nggak ada worker nyangkut)
+        with Pool(processes=workers, initializer=_init_worker, initargs=(cfg,)) as pool:
+            n_docs = write_jsonl(paths.processed_jsonl, pool.imap(_process_row, rows, chunksize=64))
+            pool.close()
+            pool.join()
+    else:
+        _init_worker(cfg)
+        n_docs = write_jsonl(paths.processed_jsonl, map(_process_row, rows))
 
-    write_jsonl(paths.processed_jsonl, out)
     print(
-        f"[preprocess] wrote: {paths.processed_jsonl} docs={len(out)} "
+        f"[preprocess] wrote: {paths.processed_jsonl} docs={n_docs} "
         f"stemming_mode={stem_mode} "
         f"sastrawi_stopwords={settings.use_sastrawi_stopwords} "
         f"domain_stopwords={settings.use_domain_stopwords} "
         f"field_boosting={'on' if use_boost else 'off'}"
     )
+    if not use_pool:
+        # hit rate cache cuma kelihatan di process ini (worker pool punya cache sendiri)
+        stem_ci = stem_cache_info()
+        print(
+            f"[preprocess] text cache: {_tokens_for_text.cache_info()} "
+            f"selective cache: {stem_ci['selective']} stem cache: {stem_ci['stem']}"
+        )
 
 
 if __name__ == "__main__":
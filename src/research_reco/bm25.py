@@ -3,7 +3,10 @@ from __future__ import annotations
 
 import math
 import pickle
+from collections import Counter
 from dataclasses import dataclass
+from heapq import nlargest
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 
@@ -19,6 +22,23 @@ class BM25Index:
     postings: Dict[str, List[Tuple[int, int]]]
     docs_meta: List[Dict[str, Any]]
 
+    # eager BM25 weight per posting (term -> [(doc_idx, weight)]), bm25s-style.
+    # Filled at build time; indexes pickled before this field existed get it lazily.
+    weights: Optional[Dict[str, List[Tuple[int, float]]]] = None
+
+    # per-doc k1 * (1 - b + b * dl / avgdl), shared by the eager weights and explain_bm25
+    denom_norm: Optional[List[float]] = None
+
+    def denom_norms(self) -> List[float]:
+        if getattr(self, "denom_norm", None) is None:
+            self.denom_norm = _denom_norms(self.doc_len, self.avgdl, self.k1, self.b)
+        return self.denom_norm
+
+    def term_weights(self) -> Dict[str, List[Tuple[int, float]]]:
+        if getattr(self, "weights", None) is None:
+            self.weights = _eager_weights(self.postings, self.idf, self.denom_norms(), self.k1)
+        return self.weights
+
     def save(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("wb") as f:
@@ -46,22 +66,51 @@ class BM25Index:
             q_terms[t] = q_terms.get(t, 0) + 1
 
         scores = [0.0] * N
+        weights = self.term_weights()
 
         for term in q_terms.keys():
-            plist = self.postings.get(term)
+            plist = weights.get(term)
             if not plist:
                 continue
 
-            idf = float(self.idf.get(term, 0.0))
-
-            for doc_idx, tf in plist:
-                dl = self.doc_len[doc_idx]
-                denom = tf + self.k1 * (1 - self.b + self.b * (dl / (self.avgdl + 1e-9)))
-                scores[doc_idx] += idf * (tf * (self.k1 + 1) / (denom + 1e-9))
+            for doc_idx, w in plist:
+                scores[doc_idx] += w
 
         return scores
 
 
+def _denom_norm(dl: float, avgdl: float, k1: float, b: float) -> float:
+    # single source of the BM25 length normalization (also used by explain_bm25)
+    return k1 * (1 - b + b * (dl / (avgdl + 1e-9)))
+
+
+def _denom_norms(doc_len: List[int], avgdl: float, k1: float, b: float) -> List[float]:
+    # k1 * length normalization depends only on the doc: once per doc, not per posting
+    return [_denom_norm(dl, avgdl, k1, b) for dl in doc_len]
+
+
+def _eager_weights(
+    postings: Dict[str, List[Tuple[int, int]]],
+    idf: Dict[str, float],
+    len_norm: List[float],
+    k1: float,
+) -> Dict[str, List[Tuple[int, float]]]:
+    """
+    Precompute the BM25 contribution of every (term, doc) posting once,
+    so query time is only a sum over the postings of the query terms.
+    """
+    k1p = k1 + 1
+
+    out: Dict[str, List[Tuple[int, float]]] = {}
+    for term, plist in postings.items():
+        term_idf = float(idf.get(term, 0.0))
+        out[term] = [
+            (doc_idx, term_idf * (tf * k1p / (tf + len_norm[doc_idx] + 1e-9)))
+            for doc_idx, tf in plist
+        ]
+    return out
+
+
 def build_bm25_index(
     docs_tokens: List[List[str]],
     docs_meta: List[Dict[str, Any]],
@@ -77,23 +126,23 @@ def build_bm25_index(
     avgdl = (sum(doc_len) / N) if N else 0.0
 
     for i, toks in enumerate(docs_tokens):
-        tf: Dict[str, int] = {}
-        for t in toks:
-            if not t:
-                continue
-            tf[t] = tf.get(t, 0) + 1
+        # counted in C; keeps first-seen order like the old dict loop
+        tf = Counter(t for t in toks if t)
 
         for t, f in tf.items():
             vocab_df[t] = vocab_df.get(t, 0) + 1
             postings.setdefault(t, []).append((i, f))
 
-    idf: Dict[str, float] = {}
-    for t, df in vocab_df.items():
-        idf[t] = math.log(1 + (N - df + 0.5) / (df + 0.5)) if N else 0.0
+    log = math.log
+    idf: Dict[str, float] = (
+        {t: log(1 + (N - df + 0.5) / (df + 0.5)) for t, df in vocab_df.items()}
+        if N else dict.fromkeys(vocab_df, 0.0)
+    )
 
     if len(docs_meta) != N:
         raise ValueError(f"docs_meta length ({len(docs_meta)}) must match docs_tokens length ({N})")
 
+    denom_norm = _denom_norms(doc_len, avgdl, k1, b)
     return BM25Index(
         k1=k1,
         b=b,
@@ -103,6 +152,8 @@ def build_bm25_index(
         avgdl=avgdl,
         postings=postings,
         docs_meta=docs_meta,
+        weights=_eager_weights(postings, idf, denom_norm, k1),
+        denom_norm=denom_norm,
     )
 
 
@@ -121,7 +172,7 @@ def bm25_search(
     if not query_tokens:
         return []
 
-    # Compute sparse scores only for docs hit by postings (faster)
+    # Sparse accumulation over precomputed postings weights (only docs hit)
     scores: Dict[int, float] = {}
 
     q_terms: Dict[str, int] = {}
@@ -130,37 +181,35 @@ def bm25_search(
             continue
         q_terms[t] = q_terms.get(t, 0) + 1
 
+    weights = index.term_weights()
+
     for term in q_terms.keys():
-        plist = index.postings.get(term)
+        plist = weights.get(term)
         if not plist:
             continue
 
-        idf = float(index.idf.get(term, 0.0))
-
-        for doc_idx, tf in plist:
-            dl = index.doc_len[doc_idx]
-            denom = tf + index.k1 * (1 - index.b + index.b * (dl / (index.avgdl + 1e-9)))
-            score = idf * (tf * (index.k1 + 1) / (denom + 1e-9))
-            scores[doc_idx] = scores.get(doc_idx, 0.0) + score
+        for doc_idx, w in plist:
+            scores[doc_idx] = scores.get(doc_idx, 0.0) + w
 
     if not scores:
         return []
 
-    ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+    # top_k selection without sorting every hit doc (same order as sorted()[:top_k])
+    ranked = nlargest(top_k, scores.items(), key=itemgetter(1))
 
+    docs_meta = index.docs_meta
     out: List[Dict[str, Any]] = []
     for doc_idx, score in ranked:
+        # fresh dict per hit (callers add fields like score2), built in one step;
+        # ALWAYS attach doc_idx and score
         if include_meta:
-            meta = index.docs_meta[doc_idx].copy()
+            meta = {**docs_meta[doc_idx], "doc_idx": int(doc_idx), "score": float(score)}
         else:
-            meta = {}
-
-        # ALWAYS attach doc_idx and score
-        meta["doc_idx"] = int(doc_idx)
-        meta["score"] = float(score)
+            meta = {"doc_idx": int(doc_idx), "score": float(score)}
 
         # ensure doc_id exists (for eval/UI consistency)
-        if "doc_id" not in meta or meta.get("doc_id") is None or str(meta.get("doc_id")).strip() == "":
+        did = meta.get("doc_id")
+        if did is None or str(did).strip() == "":
             meta["doc_id"] = f"doc_{doc_idx}"
 
         out.append(meta)
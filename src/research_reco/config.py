@@ -1,8 +1,23 @@
 from __future__ import annotations
+import copy
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict
 import yaml
 
+
+@lru_cache(maxsize=8)
+def _parse_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    # keyed on mtime so edits to the file are picked up without restarting
+    return yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    """Parsed YAML, cached per (path, mtime). Returns a copy, safe to mutate."""
+    # deepcopy: cache entry-nya shared, jangan sampai caller ngubah isi cache
+    return copy.deepcopy(_parse_yaml(str(path), path.stat().st_mtime_ns))
+
 @dataclass(frozen=True)
 class AppPaths:
     data_raw: Path
@@ -23,7 +38,7 @@ class AppPaths:
 
 
 def load_paths(config_file: str = "configs/paths.yaml") -> AppPaths:
-    cfg = yaml.safe_load(Path(config_file).read_text(encoding="utf-8"))
+    cfg = _read_yaml(Path(config_file))
 
     def p(k: str) -> Path:
         return Path(cfg[k])
@@ -60,9 +75,9 @@ class AppSettings:
 
 
 def load_settings(config_file: str = "configs/paths.yaml") -> AppSettings:
-    cfg = yaml.safe_load(Path(config_file).read_text(encoding="utf-8"))
+    cfg = _read_yaml(Path(config_file))
     settings_path = Path(cfg.get("settings_file", "configs/settings.yaml"))
-    s = yaml.safe_load(settings_path.read_text(encoding="utf-8"))
+    s = _read_yaml(settings_path)
 
     mode = str(s.get("stemming_mode", "selective")).lower().strip()
     if mode not in {"off", "full", "selective"}:
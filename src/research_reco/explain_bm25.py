@@ -1,55 +1,78 @@
 # src/research_reco/explain_bm25.py
 from __future__ import annotations
+from bisect import bisect_left
+from heapq import nlargest
+from operator import itemgetter
 from typing import Dict, List, Any, Tuple
 
+from .bm25 import _denom_norm
+
 def _get_attr(obj, names: List[str], default=None):
     for n in names:
         if hasattr(obj, n):
             return getattr(obj, n)
     return default
 
-def bm25_term_contributions(index, query_tokens: List[str], doc_idx: int) -> List[Dict[str, Any]]:
+def _term_contributions(index, query_tokens: List[str], doc_idx: int) -> List[Dict[str, Any]]:
     """
-    Duck-typing: index minimal punya idf, doc_term_freqs, doc_lens, avgdl, k1, b.
+    Duck-typing: index minimal punya idf, doc_term_freqs (atau postings), doc_lens, avgdl, k1, b.
+    BM25Index: tf diambil dari postings dan denom pakai denom_norms() yang dihitung sekali per doc;
+    index duck-typed lain pakai rumus yang sama (bm25._denom_norm).
+    Urutan = urutan query term (belum di-sort).
     """
     idf: Dict[str, float] = _get_attr(index, ["idf"], {}) or {}
     doc_term_freqs = _get_attr(index, ["doc_term_freqs", "doc_tf", "term_freqs"], None)
+    postings = _get_attr(index, ["postings"], None)
     doc_lens = _get_attr(index, ["doc_lens", "doc_len", "doc_lengths"], None)
     avgdl = float(_get_attr(index, ["avgdl"], 1.0) or 1.0)
     k1 = float(_get_attr(index, ["k1"], 1.5) or 1.5)
     b = float(_get_attr(index, ["b"], 0.75) or 0.75)
 
-    if doc_term_freqs is None or doc_lens is None:
+    if (doc_term_freqs is None and postings is None) or doc_lens is None:
         return []
 
-    tf_map: Dict[str, int] = doc_term_freqs[doc_idx]
-    dl: float = float(doc_lens[doc_idx])
+    # unique, preserve order
+    uniq = list(dict.fromkeys(t.lower() for t in query_tokens if t))
 
-    q = [t.lower() for t in query_tokens]
-    uniq = []
-    seen = set()
-    for t in q:
-        if t and t not in seen:
-            uniq.append(t)
-            seen.add(t)
+    if doc_term_freqs is not None:
+        tf_map: Dict[str, int] = doc_term_freqs[doc_idx]
+    else:
+        # postings per term urut doc_idx (dibangun berurutan) -> bisect, cukup untuk term query
+        tf_map = {}
+        for term in uniq:
+            plist = postings.get(term)
+            if not plist:
+                continue
+            i = bisect_left(plist, (doc_idx,))
+            if i < len(plist) and plist[i][0] == doc_idx:
+                tf_map[term] = plist[i][1]
 
-    contribs = []
-    denom_norm = k1 * (1 - b + b * (dl / avgdl))
+    if hasattr(index, "denom_norms"):
+        denom_norm = float(index.denom_norms()[doc_idx])
+    else:
+        denom_norm = _denom_norm(float(doc_lens[doc_idx]), avgdl, k1, b)
+    k1p = k1 + 1
 
+    contribs = []
     for term in uniq:
         tf = tf_map.get(term, 0)
         if tf <= 0:
             continue
         term_idf = float(idf.get(term, 0.0))
-        score = term_idf * (tf * (k1 + 1)) / (tf + denom_norm)
+        # rumus persis sama dengan bm25._eager_weights (termasuk epsilon), biar jumlahnya = skor search
+        score = term_idf * (tf * k1p / (tf + denom_norm + 1e-9))
         contribs.append({"term": term, "tf": tf, "idf": term_idf, "score": score})
 
-    contribs.sort(key=lambda x: x["score"], reverse=True)
+    return contribs
+
+def bm25_term_contributions(index, query_tokens: List[str], doc_idx: int) -> List[Dict[str, Any]]:
+    contribs = _term_contributions(index, query_tokens, doc_idx)
+    contribs.sort(key=itemgetter("score"), reverse=True)
     return contribs
 
 def explain_doc(index, query_tokens: List[str], doc_idx: int, top_terms: int = 6) -> Dict[str, Any]:
-    contribs = bm25_term_contributions(index, query_tokens, doc_idx)
-    top = contribs[:top_terms]
+    # cuma butuh top_terms teratas: nlargest (urutan sama dengan sort + slice)
+    top = nlargest(top_terms, _term_contributions(index, query_tokens, doc_idx), key=itemgetter("score"))
     return {
         "matched_terms": [x["term"] for x in top],
         "term_contributions": top,
@@ -1,27 +1,66 @@
 from __future__ import annotations
 import json
 from pathlib import Path
-from typing import Iterable, Dict, Any, List
+from typing import Iterable, Iterator, Dict, Any, List
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ModuleNotFoundError:
+    orjson = None
+    _HAS_ORJSON = False
 
-def write_jsonl(path: Path, rows: Iterable[Dict[str, Any]]) -> None:
+# orjson parses bytes directly (~2-5x faster); stdlib json also accepts bytes.
+# orjson writes compact UTF-8 JSON; the stdlib fallback keeps json.dumps formatting.
+_loads = orjson.loads if _HAS_ORJSON else json.loads
+
+_READ_BUFFER = 1 << 20  # 1 MiB
+_WRITE_BUFFER = 1 << 20  # 1 MiB
+_WRITE_BLOCK_ROWS = 1000
+
+
+def _dumps_line(row: Dict[str, Any]) -> bytes:
+    if _HAS_ORJSON:
+        return orjson.dumps(row) + b"\n"
+    return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def write_jsonl(path: Path, rows: Iterable[Dict[str, Any]]) -> int:
+    """Write rows (any iterable, consumed lazily); returns the number of rows written."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
+    n = 0
+    with path.open("wb", buffering=_WRITE_BUFFER) as f:
+        # encode in blocks and hand each block to writelines (fewer write calls)
+        block: List[bytes] = []
         for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            block.append(_dumps_line(r))
+            if len(block) >= _WRITE_BLOCK_ROWS:
+                f.writelines(block)
+                n += len(block)
+                block.clear()
+        if block:
+            f.writelines(block)
+            n += len(block)
+    return n
 
 
-def read_jsonl(path: Path) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
+def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield rows one by one (no full list in memory)."""
     if not path.exists():
-        return out
-    with path.open("r", encoding="utf-8") as f:
+        return
+    with path.open("rb", buffering=_READ_BUFFER) as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
-            out.append(json.loads(line))
-    return out
+            yield _loads(line)
+
+
+def read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    """Read the whole file in one go and parse it line by line (no per-line file reads)."""
+    if not path.exists():
+        return []
+    return [_loads(line) for line in path.read_bytes().split(b"\n") if line.strip()]
 
 
 def write_json(path: Path, obj: Any) -> None:
@@ -30,4 +69,4 @@ def write_json(path: Path, obj: Any) -> None:
 
 
 def read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return _loads(path.read_bytes())
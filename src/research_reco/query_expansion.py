@@ -1,13 +1,16 @@
 # src/research_reco/query_expansion.py
 from __future__ import annotations
 
-from typing import Dict, List, Any, Set, Tuple, Optional
+from collections import Counter
+from heapq import nlargest
+from operator import itemgetter
+from typing import Dict, FrozenSet, List, Any, Tuple, Optional
 import math
 
 
 # Generic words that commonly appear across many papers.
 # We do *not* want these in expansions.
-GENERIC_TERMS: Set[str] = {
+GENERIC_TERMS: FrozenSet[str] = frozenset({
     # Indo
     "penelitian", "analisis", "sistem", "metode", "model", "algoritma",
     "menggunakan", "berbasis", "dengan", "untuk", "pada", "dalam", "terhadap",
@@ -25,7 +28,15 @@ GENERIC_TERMS: Set[str] = {
     "algorithm", "algorithms", "approach", "using", "based", "data",
     "dataset", "feature", "features", "evaluation", "performance",
     "application", "implementation", "design",
-}
+})
+
+
+def expansion_candidates(tokens: List[str]) -> Tuple[str, ...]:
+    """
+    Doc tokens that can ever be expansion terms (query-independent part of the filter).
+    Precompute once per doc and store as doc["_expand_tokens"] to skip it per query.
+    """
+    return tuple(t for t in tokens if t and len(t) > 2 and t not in GENERIC_TERMS)
 
 
 def expand_query_from_top_docs(
@@ -40,9 +51,11 @@ def expand_query_from_top_docs(
     min_idf: float = 0.35,
 ) -> List[str]:
 
-    qset: Set[str] = set(query_tokens)
-    tf: Dict[str, int] = {}
-    df: Dict[str, int] = {}
+    qset: FrozenSet[str] = frozenset(query_tokens)
+    # one membership test per token instead of two (query terms + generic terms)
+    skip: FrozenSet[str] = qset | GENERIC_TERMS
+    tf: Dict[str, int] = Counter()
+    df: Dict[str, int] = Counter()
 
     used = 0
     for h in initial_hits[:top_docs]:
@@ -54,25 +67,25 @@ def expand_query_from_top_docs(
             continue
 
         used += 1
-        toks = doc.get("tokens", []) or []
-        seen_in_doc = set()
-
-        for t in toks:
-            if not t or len(t) <= 2:
-                continue
-            if t in qset:
-                continue
-            if t in GENERIC_TERMS:
-                continue
-            tf[t] = tf.get(t, 0) + 1
-            seen_in_doc.add(t)
-
-        for t in seen_in_doc:
-            df[t] = df.get(t, 0) + 1
+        # count every occurrence in C (Counter), then filter once per unique token
+        toks = doc.get("_expand_tokens")
+        if toks is not None:
+            # already length/GENERIC_TERMS filtered at load time
+            counts = {t: n for t, n in Counter(toks).items() if t not in qset}
+        else:
+            counts = {
+                t: n for t, n in Counter(doc.get("tokens", []) or []).items()
+                if t and len(t) > 2 and t not in skip
+            }
+        tf.update(counts)
+        df.update(counts.keys())
 
     if used == 0:
         return query_tokens
 
+    # df per term is bounded by the number of docs used, so tabulate log(1 + df) once
+    log1p_df = [math.log(1.0 + float(i)) for i in range(used + 1)]
+
     scored: List[Tuple[str, float]] = []
     for t, c in tf.items():
         dfi = df.get(t, 1)
@@ -88,7 +101,7 @@ def expand_query_from_top_docs(
         # - repeated terms across docs (df)
         # - frequent term in top-docs (tf)
         # - globally specific terms (idf)
-        score = float(c) * math.log(1.0 + float(dfi))
+        score = float(c) * log1p_df[dfi]
         if idf is not None:
             score *= max(0.0, term_idf)
 
@@ -97,7 +110,7 @@ def expand_query_from_top_docs(
     if not scored:
         return query_tokens
 
-    scored.sort(key=lambda x: x[1], reverse=True)
-    expansion = [t for t, _ in scored[:max_expand]]
+    # top max_expand without sorting the whole candidate list (same order as sorted()[:n])
+    expansion = [t for t, _ in nlargest(max_expand, scored, key=itemgetter(1))]
 
     return query_tokens + expansion
@@ -36,11 +36,17 @@ def recommend_citations(
     top_k: int = 10,
     diversify: bool = True,
     original_query_tokens: Optional[List[str]] = None,
+    hits: Optional[List[Dict[str, Any]]] = None,
 ) -> List[Dict[str, Any]]:
     # pull more candidates than needed
     candidate_k = max(30, top_k * 5)
 
-    hits = bm25_search(bm25, query_tokens, top_k=candidate_k, include_meta=True)
+    # caller may pass hits already ranked for these exact query_tokens
+    # (e.g. when query expansion added nothing) to skip a second BM25 pass
+    if hits is None:
+        hits = bm25_search(bm25, query_tokens, top_k=candidate_k, include_meta=True)
+    else:
+        hits = hits[:candidate_k]
 
     if not hits:
         return []
@@ -64,19 +70,22 @@ def recommend_citations(
         # simple: prefer unique URLs/titles first
         seen = set()
         diversified = []
+        picked = set()  # id() of hits already in diversified (avoids O(n) dict compares)
         for h in filtered:
             key = (h.get("url") or h.get("judul") or h.get("doc_id") or "")
             if key in seen:
                 continue
             seen.add(key)
             diversified.append(h)
+            picked.add(id(h))
         # if too few, fill from remainder
         if len(diversified) < len(filtered):
             for h in filtered:
                 if len(diversified) >= len(filtered):
                     break
-                if h not in diversified:
+                if id(h) not in picked:
                     diversified.append(h)
+                    picked.add(id(h))
         filtered = diversified
 
     # attach score2 if you have rerank elsewhere (keep compatible)
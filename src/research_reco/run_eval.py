@@ -1,15 +1,18 @@
 from __future__ import annotations
 from pathlib import Path
-import json
+import math
 import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[2] / "src"))
 
 from research_reco.config import load_paths, load_settings
-from research_reco.io_utils import read_jsonl
+from research_reco.io_utils import iter_jsonl
 from research_reco.bm25 import BM25Index, bm25_search
 from research_reco.text_utils import load_stopwords, preprocess_text
 
+# log2(i + 1) untuk posisi 1..100 (indeks 0 tidak dipakai)
+_LOG2 = [0.0] + [math.log2(i + 1) for i in range(1, 101)]
+
 def precision_at_k(ranked, relevant, k):
     if k <= 0: return 0.0
     hit = 0
@@ -24,21 +27,24 @@ def mrr_at_k(ranked, relevant, k):
             return 1.0 / i
     return 0.0
 
-def ndcg_at_k(ranked, rel_map, k):
+def ideal_order(rel_map):
+    """doc_id urut relevansi menurun; cukup dihitung sekali per query."""
+    return [d for d, _ in sorted(rel_map.items(), key=lambda x: x[1], reverse=True)]
+
+def ndcg_at_k(ranked, rel_map, k, ideal_ranked=None):
     # rel_map: doc_id -> relevance (0..3)
     def dcg(items):
         s = 0.0
         for i, d in enumerate(items, start=1):
             rel = float(rel_map.get(d, 0.0))
             if rel > 0:
-                s += (2**rel - 1) / (math.log2(i + 1))
+                s += (2**rel - 1) / (_LOG2[i] if i < len(_LOG2) else math.log2(i + 1))
         return s
 
-    import math
     dcg_val = dcg(ranked[:k])
-    ideal = sorted(rel_map.items(), key=lambda x: x[1], reverse=True)
-    ideal_ranked = [d for d, _ in ideal][:k]
-    idcg = dcg(ideal_ranked)
+    if ideal_ranked is None:
+        ideal_ranked = ideal_order(rel_map)
+    idcg = dcg(ideal_ranked[:k])
     return 0.0 if idcg == 0 else dcg_val / idcg
 
 def main():
@@ -57,7 +63,7 @@ def main():
         use_domain=settings.use_domain_stopwords,
     )
 
-    rows = [json.loads(x) for x in eval_file.read_text(encoding="utf-8").splitlines() if x.strip()]
+    rows = iter_jsonl(eval_file)  # streamed, one query row at a time
     ks = [5, 10]
 
     agg = {f"P@{k}": 0.0 for k in ks}
@@ -75,10 +81,12 @@ def main():
         res = bm25_search(index, q_tokens, top_k=50)
         ranked_doc_ids = [x["doc_id"] for x in res]
 
+        ideal_ranked = ideal_order(rel_map) if rel_map else None
+
         for k in ks:
             agg[f"P@{k}"] += precision_at_k(ranked_doc_ids, relevant, k) if relevant else 0.0
             agg[f"MRR@{k}"] += mrr_at_k(ranked_doc_ids, relevant, k) if relevant else 0.0
-            agg[f"nDCG@{k}"] += ndcg_at_k(ranked_doc_ids, rel_map, k) if rel_map else 0.0
+            agg[f"nDCG@{k}"] += ndcg_at_k(ranked_doc_ids, rel_map, k, ideal_ranked) if rel_map else 0.0
 
         n += 1
 
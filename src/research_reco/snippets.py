@@ -1,9 +1,45 @@
 # src/research_reco/snippets.py
 from __future__ import annotations
 import re
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 
 _SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"[a-zA-Z0-9_]+")
+
+
+@lru_cache(maxsize=1024)
+def _terms_pattern(terms: Tuple[str, ...]) -> "re.Pattern[str]":
+    # satu alternation untuk semua query term, whole-word (boundary sama dengan _WORD_RE)
+    alt = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    # IGNORECASE|ASCII: cocokkan langsung ke teks asli, tanpa bikin salinan lowercase
+    return re.compile(rf"(?<![a-zA-Z0-9_])(?:{alt})(?![a-zA-Z0-9_])", re.IGNORECASE | re.ASCII)
+
+
+@lru_cache(maxsize=4096)
+def highlight_pattern(terms: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Regex highlight (group 1 = term) untuk UI; terms sudah urut longest-first.
+    Di-cache di sini, bukan di streamlit_app: script app dieksekusi ulang tiap rerun,
+    jadi lru_cache yang didefinisikan di sana ikut hilang.
+    """
+    # satu alternation buat semua term (longest-first), jadi teks cuma di-scan sekali
+    # boundary: not letter/digit/underscore around term
+    alt = "|".join(re.escape(t) for t in terms)
+    return re.compile(
+        rf"(?<![A-Za-z0-9_])({alt})(?![A-Za-z0-9_])",
+        flags=re.IGNORECASE,
+    )
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Same pieces as _SENT_SPLIT.split(text), produced lazily."""
+    start = 0
+    for m in _SENT_SPLIT.finditer(text):
+        yield text[start:m.start()]
+        start = m.end()
+    yield text[start:]
+
 
 def best_snippet(text: str, query_tokens: List[str], max_len: int = 260) -> Dict[str, Any]:
     """
@@ -12,23 +48,27 @@ def best_snippet(text: str, query_tokens: List[str], max_len: int = 260) -> Dict
     if not text:
         return {"snippet": "", "score": 0, "matched": []}
 
-    sents = _SENT_SPLIT.split(text.strip())
     qset = set(t.lower() for t in query_tokens if t)
 
+    # cuma term yang bisa jadi token utuh yang mungkin match
+    terms = tuple(sorted(t for t in qset if _WORD_RE.fullmatch(t)))
+    pat = _terms_pattern(terms) if terms else None
+
     best = ""
     best_score = -1
     best_matched = []
 
-    for s in sents:
-        toks = re.findall(r"[a-zA-Z0-9_]+", s.lower())
-        tset = set(toks)
-        matched = sorted(list(qset.intersection(tset)))
+    for s in _iter_sentences(text.strip()):
+        matched = sorted({m.lower() for m in pat.findall(s)}) if pat is not None else []
         score = len(matched)
 
         if score > best_score:
             best_score = score
             best = s.strip()
             best_matched = matched
+            # semua term sudah ketemu: kalimat berikutnya nggak mungkin lebih baik
+            if score == len(terms):
+                break
 
     if len(best) > max_len:
         best = best[:max_len].rsplit(" ", 1)[0] + "..."
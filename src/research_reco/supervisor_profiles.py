@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import math
-from collections import defaultdict
-from typing import Dict, List, Any, Tuple
+from collections import Counter, defaultdict
+from heapq import nlargest
+from operator import itemgetter, mul
+from typing import Dict, FrozenSet, List, Any, Tuple
 
 # otomatis mengangkat dosen yang domainnya beda jauh.
-GENERIC_TERMS = {
+GENERIC_TERMS: FrozenSet[str] = frozenset({
     # Indo
     "deteksi", "prediksi", "klasifikasi", "klaster", "pengembangan", "analisis",
     "sistem", "metode", "model", "algoritma", "pendekatan", "penerapan",
@@ -17,7 +19,7 @@ GENERIC_TERMS = {
     "approach", "system", "analysis", "data", "feature", "features",
     "classification", "prediction", "detection", "optimization", "evaluation",
     "machine", "learning", "deep", "neural", "network", "networks",
-}
+})
 
 
 def _parse_year(tanggal: str | None) -> int:
@@ -47,57 +49,56 @@ def build_supervisor_profiles(processed_docs: List[Dict[str, Any]]) -> Dict[str,
     for d in dosen_docs:
         grouped[str(d["dosen"])].append(d)
 
-    # tf per dosen
+    # tf per dosen (Counter counts in C, same first-seen key order as a dict loop)
     tf_dosen: Dict[str, Dict[str, int]] = {}
     for dosen, docs in grouped.items():
-        tf: Dict[str, int] = defaultdict(int)
-        for doc in docs:
-            for t in doc.get("tokens", []) or []:
-                if not t:
-                    continue
-                tf[t] += 1
+        tf = Counter(t for doc in docs for t in (doc.get("tokens", []) or []) if t)
         tf_dosen[dosen] = dict(tf)
 
     # df across dosen
-    df: Dict[str, int] = defaultdict(int)
-    for _, tf in tf_dosen.items():
-        for term in tf.keys():
-            df[term] += 1
+    df: Dict[str, int] = Counter()
+    for tf in tf_dosen.values():
+        df.update(tf.keys())
 
     N = max(1, len(tf_dosen))
-    idf: Dict[str, float] = {}
-    for term, dfi in df.items():
-        # BM25-style idf
-        idf[term] = math.log(1 + (N - dfi + 0.5) / (dfi + 0.5))
+    log = math.log
+    # BM25-style idf
+    idf: Dict[str, float] = {term: log(1 + (N - dfi + 0.5) / (dfi + 0.5)) for term, dfi in df.items()}
+
+    # tf weight cuma bergantung pada nilai tf (sedikit nilai unik) -> hitung sekali per nilai
+    tf_weight: Dict[int, float] = {
+        f: 1.0 + _safe_log1p(f) for f in {f for tf in tf_dosen.values() for f in tf.values()}
+    }
 
     # Build profiles
     profiles: Dict[str, Any] = {}
     for dosen, tf in tf_dosen.items():
-        vec: Dict[str, float] = {}
-        for term, f in tf.items():
-            vec[term] = (1.0 + _safe_log1p(f)) * float(idf.get(term, 0.0))
+        vec: Dict[str, float] = {term: tf_weight[f] * float(idf.get(term, 0.0)) for term, f in tf.items()}
 
-        norm = math.sqrt(sum(v * v for v in vec.values())) + 1e-9
+        # sum(map(mul, ...)) = jumlah kuadrat yang sama, tanpa generator frame per elemen
+        ws = vec.values()
+        norm = math.sqrt(sum(map(mul, ws, ws))) + 1e-9
 
         # top_terms: avoid extremely generic terms (idf too low)
         idf_cutoff = 0.15
-        top_terms_scored = sorted(
+        # nlargest == sorted(reverse=True)[:n] (ties included), tanpa sort penuh
+        top_terms_scored = nlargest(
+            25,
             ((t, w) for t, w in vec.items() if idf.get(t, 0.0) >= idf_cutoff),
-            key=lambda x: x[1],
-            reverse=True
-        )[:25]
+            key=itemgetter(1),
+        )
 
         # fallback if filtering removed too much
         if len(top_terms_scored) < 8:
-            top_terms_scored = sorted(vec.items(), key=lambda x: x[1], reverse=True)[:25]
+            top_terms_scored = nlargest(25, vec.items(), key=itemgetter(1))
 
         top_terms_only = [t for t, _ in top_terms_scored[:20]]
 
         pubs = grouped[dosen]
-        pubs_sorted = sorted(pubs, key=lambda d: _parse_year(d.get("tanggal")), reverse=True)
+        pubs_sorted = nlargest(3, pubs, key=lambda d: _parse_year(d.get("tanggal")))
 
         samples = []
-        for p in pubs_sorted[:3]:
+        for p in pubs_sorted:
             samples.append({
                 "doc_id": p.get("doc_id"),
                 "judul": p.get("judul"),
@@ -123,6 +124,35 @@ def build_supervisor_profiles(processed_docs: List[Dict[str, Any]]) -> Dict[str,
     }
 
 
+# id(profiles) -> (profiles, postings). Referensi profiles ikut disimpan supaya id-nya
+# nggak bisa dipakai ulang object lain selama entry masih ada di cache.
+_POSTINGS_CACHE: Dict[int, Tuple[Dict[str, Any], Dict[str, List[str]]]] = {}
+_POSTINGS_CACHE_MAX = 4
+
+
+def _profile_postings(profiles: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    term -> dosen yang vektornya memuat term itu.
+    Di-cache di level modul per dict profiles (bukan ditulis ke profiles_obj milik caller),
+    jadi dict baru otomatis dapat postings baru.
+    """
+    hit = _POSTINGS_CACHE.get(id(profiles))
+    if hit is not None and hit[0] is profiles:
+        return hit[1]
+
+    postings: Dict[str, List[str]] = defaultdict(list)
+    for dosen, info in profiles.items():
+        for term in (info.get("vector", {}) or {}):
+            postings[term].append(dosen)
+    postings = dict(postings)
+
+    if len(_POSTINGS_CACHE) >= _POSTINGS_CACHE_MAX:
+        # buang entry paling lama (dict urut insert)
+        _POSTINGS_CACHE.pop(next(iter(_POSTINGS_CACHE)))
+    _POSTINGS_CACHE[id(profiles)] = (profiles, postings)
+    return postings
+
+
 def recommend_supervisors(
     profiles_obj: Dict[str, Any],
     query_tokens: List[str],
@@ -138,11 +168,7 @@ def recommend_supervisors(
     profiles: Dict[str, Any] = profiles_obj.get("profiles", {}) or {}
 
     # query tf
-    qtf: Dict[str, int] = defaultdict(int)
-    for t in query_tokens or []:
-        if not t:
-            continue
-        qtf[t] += 1
+    qtf: Dict[str, int] = Counter(t for t in (query_tokens or []) if t)
 
     q_terms_unique = list(qtf.keys())
     anchor_candidates = [t for t in q_terms_unique if t in idf and t not in GENERIC_TERMS]
@@ -169,14 +195,18 @@ def recommend_supervisors(
             if w > 0:
                 qvec[term] = float(w)
 
-    qnorm = math.sqrt(sum(v * v for v in qvec.values())) + 1e-9
+    qws = qvec.values()
+    qnorm = math.sqrt(sum(map(mul, qws, qws))) + 1e-9
     qset = set(query_tokens or [])
+    # (term, q_w) dibekukan sekali per query, dipakai ulang untuk tiap dosen
+    q_items: Tuple[Tuple[str, float], ...] = tuple(qvec.items())
 
     def cosine_and_evidence(vec: Dict[str, float], norm: float, top_evidence: int = 6) -> Tuple[float, List[Dict[str, Any]]]:
         dot = 0.0
         evidence = []
-        for term, qw in qvec.items():
-            dw = float(vec.get(term, 0.0))
+        vget = vec.get
+        for term, qw in q_items:
+            dw = float(vget(term, 0.0))
             if dw <= 0:
                 continue
             c = qw * dw
@@ -184,12 +214,21 @@ def recommend_supervisors(
             evidence.append({"term": term, "q_w": float(qw), "d_w": float(dw), "contrib": float(c)})
 
         sim = dot / (qnorm * (float(norm) + 1e-9))
-        evidence.sort(key=lambda x: x["contrib"], reverse=True)
-        return float(sim), evidence[:top_evidence]
+        return float(sim), nlargest(top_evidence, evidence, key=itemgetter("contrib"))
+
+    # dosen tanpa satu pun term query di vektornya pasti sim=0 & matched kosong -> skip,
+    # jadi cukup cek kandidat dari postings (urutan tetap ikut profiles).
+    # Kalau ada anchor, dosen lolos gating pasti ada di postings anchor (anchor subset qset),
+    # jadi kandidat langsung dipersempit ke sana.
+    postings = _profile_postings(profiles)
+    gate_terms = anchors if anchors else qset
+    candidates = {dosen for t in gate_terms for dosen in postings.get(t, ())}
 
     scored: List[Dict[str, Any]] = []
 
     for dosen, info in profiles.items():
+        if dosen not in candidates:
+            continue
         vec = info.get("vector", {}) or {}
         norm = float(info.get("norm", 1.0))
 
@@ -222,7 +261,9 @@ def recommend_supervisors(
             "top_terms": (info.get("top_terms", []) or [])[:10],
         })
 
-    scored.sort(key=lambda x: x["score"], reverse=True)
+    # filter tidak bergantung urutan, jadi cukup ambil top_k di akhir:
+    # nlargest == sorted(reverse=True)[:top_k] (stabil, ties ikut urutan profiles)
+    by_score = itemgetter("score")
 
     # Hard filter: buang similarity kecil banget (noise), tapi tetap relatif.
     if scored:
@@ -230,6 +271,6 @@ def recommend_supervisors(
         cutoff = max(float(min_similarity), float(best_sim) * float(rel_cutoff))
         filtered = [x for x in scored if float(x.get("similarity", 0.0)) >= cutoff]
         if filtered:
-            return filtered[:top_k]
+            return nlargest(top_k, filtered, key=by_score)
 
-    return scored[:top_k]
+    return nlargest(top_k, scored, key=by_score)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set, Optional
+from typing import AbstractSet, FrozenSet, List, Set, Optional
 
 try:
     from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
@@ -17,34 +18,50 @@ _WORD_RE = re.compile(r"[a-zA-Z0-9_]+", re.UNICODE)
 _STEMMER = StemmerFactory().create_stemmer() if _HAS_SASTRAWI else None
 _SASTRAWI_STOPWORDS = set(StopWordRemoverFactory().get_stop_words()) if _HAS_SASTRAWI else set()
 
-_TECH_WHITELIST = {
+_TECH_WHITELIST: FrozenSet[str] = frozenset({
     "ai","ml","nlp","cnn","rnn","lstm","gru","svm","knn","rf","xgboost","bert","gpt",
     "embedding","transformer","token","tokenizer","dataset","benchmark","accuracy",
     "precision","recall","f1","roc","auc","api","sql","mysql","nosql","json","xml",
     "http","https","tcp","udp","gpu","cpu","ram","iot","ui","ux","devops","docker",
     "kubernetes","k8s","linux","windows","android","ios","react","nextjs","node",
     "python","java","golang","rust","c","cpp","csharp","php","javascript","typescript"
-}
+})
 
-def load_stopwords(custom_path: Path, use_sastrawi: bool, use_domain: bool) -> Set[str]:
+_EN_SUFFIXES = ("ing", "tion", "sion", "ment", "ness", "able", "ible", "ize", "ised", "ized")
+_INDO_PREFIXES = ("meng","meny","men","mem","me","peng","peny","pen","pem","di","ke","se","ber","ter","per")
+_INDO_SUFFIXES = ("kan","i","an","nya","lah","kah","pun")
+
+@lru_cache(maxsize=8)
+def _read_domain_stopwords(path: str, mtime_ns: int) -> FrozenSet[str]:
+    # keyed on mtime so edits to the file are picked up without restarting
+    lines = [x.strip().lower() for x in Path(path).read_text(encoding="utf-8").splitlines()]
+    return frozenset(x for x in lines if x and not x.startswith("#"))
+
+def load_stopwords(custom_path: Path, use_sastrawi: bool, use_domain: bool) -> FrozenSet[str]:
     base: Set[str] = set()
     if use_sastrawi and _HAS_SASTRAWI:
-        base |= set(_SASTRAWI_STOPWORDS)
+        base |= _SASTRAWI_STOPWORDS
 
     if use_domain and custom_path.exists():
-        lines = [x.strip().lower() for x in custom_path.read_text(encoding="utf-8").splitlines()]
-        base |= {x for x in lines if x and not x.startswith("#")}
+        base |= _read_domain_stopwords(str(custom_path), custom_path.stat().st_mtime_ns)
 
-    return base
+    # frozenset, bukan set: semua caller (preprocess_text, run_eval x2, build_processed,
+    # streamlit query-token filter) cuma cek membership, nggak ada yang mutate hasilnya
+    return frozenset(base)
 
 def tokenize(text: str) -> List[str]:
     text = text.lower()
     return _WORD_RE.findall(text)
 
+@lru_cache(maxsize=200_000)
+def _stem(token: str) -> str:
+    # per-token memo: corpus + queries repeat the same surface forms a lot
+    return _STEMMER.stem(token)
+
 def stem_tokens_full(tokens: List[str]) -> List[str]:
     if _STEMMER is None:
         return list(tokens)
-    return [_STEMMER.stem(t) for t in tokens]
+    return [_stem(t) for t in tokens]
 
 def _looks_technical_or_english(token: str) -> bool:
     t = token
@@ -54,11 +71,10 @@ def _looks_technical_or_english(token: str) -> bool:
         return True
     if "_" in t:
         return True
-    has_alpha = any(c.isalpha() for c in t)
-    has_digit = any(c.isdigit() for c in t)
-    if has_alpha and has_digit:
+    # campuran huruf+angka; token all-alpha (kasus umum) langsung lolos tanpa scan per char
+    if not t.isalpha() and any(c.isdigit() for c in t) and any(c.isalpha() for c in t):
         return True
-    if t.endswith(("ing", "tion", "sion", "ment", "ness", "able", "ible", "ize", "ised", "ized")):
+    if t.endswith(_EN_SUFFIXES):
         return True
     return False
 
@@ -69,41 +85,47 @@ def _looks_indonesianish(token: str) -> bool:
     if _looks_technical_or_english(t):
         return False
 
-    indo_prefixes = ("meng","meny","men","mem","me","peng","peny","pen","pem","di","ke","se","ber","ter","per")
-    indo_suffixes = ("kan","i","an","nya","lah","kah","pun")
-    if t.startswith(indo_prefixes) or t.endswith(indo_suffixes):
+    if t.startswith(_INDO_PREFIXES) or t.endswith(_INDO_SUFFIXES):
         return True
 
     return len(t) >= 5
 
+@lru_cache(maxsize=200_000)
+def _selective_stem_token(token: str) -> str:
+    # keputusan "indonesianish?" cuma bergantung pada bentuk token -> memo bareng hasil stem-nya
+    if _STEMMER is not None and _looks_indonesianish(token):
+        return _stem(token)
+    return token
+
 def selective_stem(tokens: List[str]) -> List[str]:
-    out: List[str] = []
-    for t in tokens:
-        if _looks_indonesianish(t):
-            if _STEMMER is None:
-                out.append(t)
-            else:
-                out.append(_STEMMER.stem(t))
-        else:
-            out.append(t)
-    return out
+    return [_selective_stem_token(t) for t in tokens]
+
+def stem_cache_info():
+    """Hit/miss stats of both stem caches (for pipeline logs).
+
+    Mode selective lewat _selective_stem_token dulu; token yang berulang kena cache itu
+    dan nggak pernah sampai ke _stem, jadi dua-duanya perlu dilaporkan.
+    """
+    return {"selective": _selective_stem_token.cache_info(), "stem": _stem.cache_info()}
 
 def preprocess_text(
     text: str,
-    stopwords: Set[str],
+    stopwords: AbstractSet[str],
     stem_mode: str = "off",  # "off" | "full" | "selective"
 ) -> List[str]:
-    toks = tokenize(text)
-    toks = [t for t in toks if t not in stopwords and len(t) > 1]
+    toks = [t for t in tokenize(text) if t not in stopwords and len(t) > 1]
 
     mode = (stem_mode or "off").lower().strip()
-    if mode == "full":
-        toks = stem_tokens_full(toks)
+    if mode == "full" and _STEMMER is not None:
+        stem_one = _stem
     elif mode == "selective":
-        toks = selective_stem(toks)
+        stem_one = _selective_stem_token
+    else:
+        # token tidak berubah -> filter kedua pasti no-op
+        return toks
 
-    toks = [t for t in toks if t not in stopwords and len(t) > 1]
-    return toks
+    # stem + filter ulang (hasil stem bisa jadi stopword / 1 huruf) dalam satu pass
+    return [s for s in map(stem_one, toks) if s not in stopwords and len(s) > 1]
 
 def build_text_for_index(
     judul: Optional[str],
@@ -5,6 +5,7 @@ import json
 import re
 import sys
 import urllib.parse
+from itertools import chain
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -28,11 +29,12 @@ for p in SRC_CANDIDATES:
 
 try:
     from research_reco.config import load_paths, load_settings
-    from research_reco.io_utils import read_json, read_jsonl
+    from research_reco.io_utils import read_json, iter_jsonl
     from research_reco.text_utils import load_stopwords, preprocess_text
     from research_reco.bm25 import BM25Index, bm25_search
-    from research_reco.query_expansion import expand_query_from_top_docs
+    from research_reco.query_expansion import expand_query_from_top_docs, expansion_candidates
     from research_reco.recommend import recommend_citations
+    from research_reco.snippets import highlight_pattern
     from research_reco.supervisor_profiles import recommend_supervisors
 except Exception as e:
     st.error(
@@ -231,44 +233,46 @@ _WORD_RE = re.compile(r"[A-Za-z0-9_]+", re.UNICODE)
 _SENT_SPLIT = re.compile(r"(?<=[\.!\?])\s+")
 
 
-def _matched_terms(query_terms: List[str], text: str) -> List[str]:
+def _matched_terms(query_terms: List[str], text: str, text_lower: Optional[str] = None) -> List[str]:
     if not query_terms or not text:
         return []
-    t = text.lower()
-    hits = []
-    for w in query_terms:
-        ww = str(w).lower().strip()
-        if len(ww) < 2:
-            continue
-        if ww in t:
-            hits.append(ww)
-    # unique preserve order
-    seen = set()
-    out = []
-    for x in hits:
-        if x not in seen:
-            seen.add(x)
-            out.append(x)
+    t = text_lower if text_lower is not None else text.lower()
+    # dict.fromkeys = unique preserve order
+    return list(dict.fromkeys(
+        ww for ww in (str(w).lower().strip() for w in query_terms)
+        if len(ww) >= 2 and ww in t
+    ))
+
+
+def _split_sentences(abstract: str) -> List[Tuple[str, str]]:
+    """(kalimat, kalimat.lower()) untuk tiap kalimat non-kosong; bisa diprecompute per dokumen."""
+    out: List[Tuple[str, str]] = []
+    for s in _SENT_SPLIT.split(abstract):
+        s_clean = s.strip()
+        if s_clean:
+            out.append((s_clean, s_clean.lower()))
     return out
 
 
-def _best_sentence(abstract: str, terms: List[str], max_chars: int = 320) -> str:
+def _best_sentence(
+    abstract: str,
+    terms: List[str],
+    max_chars: int = 320,
+    sentences: Optional[List[Tuple[str, str]]] = None,
+) -> str:
     if not abstract:
         return ""
-    sents = _SENT_SPLIT.split(abstract)
-    if not sents:
-        sents = [abstract]
+    if sentences is None:
+        sentences = _split_sentences(abstract)
+
+    terms_low = [str(t).lower() for t in terms if t]
 
     best = ""
     best_score = -1
-    for s in sents:
-        s_clean = s.strip()
-        if not s_clean:
-            continue
+    for s_clean, s_low in sentences:
         score = 0
-        s_low = s_clean.lower()
-        for t in terms:
-            if t and str(t).lower() in s_low:
+        for t in terms_low:
+            if t in s_low:
                 score += 1
         # prefer medium length evidence
         score = score * 10 - abs(len(s_clean) - 220) / 50
@@ -281,6 +285,9 @@ def _best_sentence(abstract: str, terms: List[str], max_chars: int = 320) -> str
     return best
 
 
+_HL_SUB = r"<b>\1</b>"
+
+
 def _highlight_html(text: str, terms: List[str]) -> str:
     """HTML-escape then bold matched terms with safe word-ish boundary."""
     if not text:
@@ -288,14 +295,9 @@ def _highlight_html(text: str, terms: List[str]) -> str:
     out = html.escape(text)
 
     uniq = {t.strip() for t in terms if isinstance(t, str) and len(t.strip()) >= 2}
-    for t in sorted(uniq, key=len, reverse=True):
-        # boundary: not letter/digit/underscore around term
-        pattern = re.compile(
-            rf"(?<![A-Za-z0-9_])({re.escape(t)})(?![A-Za-z0-9_])",
-            flags=re.IGNORECASE,
-        )
-        out = pattern.sub(r"<b>\1</b>", out)
-    return out
+    if not uniq:
+        return out
+    return highlight_pattern(tuple(sorted(uniq, key=lambda t: (-len(t), t)))).sub(_HL_SUB, out)
 
 
 def _lookup_full_doc(
@@ -315,16 +317,69 @@ def _lookup_full_doc(
         doc = docs_by_url.get(u)
 
     if doc is None and item.get("doc_idx") is not None:
+        # int(), bukan isdigit(): float 3.0 tetap resolve, string kayak "²" atau inf nggak bikin crash
         try:
             did = doc_id_by_doc_idx.get(int(item.get("doc_idx")))
             if did:
                 doc = docs_by_id.get(did)
-        except Exception:
+        except (TypeError, ValueError, OverflowError):
             pass
 
     return doc or {}
 
 
+def _format_scores(it: Dict[str, Any]) -> Tuple[str, str]:
+    """(score, score2) sebagai string 4 desimal; score2 kosong kalau nggak ada."""
+    score2 = it.get("score2")
+    score2_fmt = f"{float(score2):.4f}" if isinstance(score2, (float, int)) else ""
+    return f"{float(it.get('score', 0.0)):.4f}", score2_fmt
+
+
+def _explain_one(
+    it: Dict[str, Any],
+    highlight_terms: List[str],
+    docs_by_id: Dict[str, Dict[str, Any]],
+    docs_by_url: Dict[str, Dict[str, Any]],
+    doc_id_by_doc_idx: Dict[int, str],
+) -> Dict[str, Any]:
+    doc = _lookup_full_doc(it, docs_by_id, docs_by_url, doc_id_by_doc_idx)
+    doc_abstract = doc.get("abstrak") or doc.get("abstract")
+    if doc_abstract:
+        abstract = str(doc_abstract)
+        # precomputed di load_assets
+        abstract_lower = doc.get("_abstrak_lower")
+        sentences = doc.get("_sentences")
+    else:
+        abstract = str(it.get("abstrak") or it.get("abstract") or "")
+        abstract_lower = None
+        sentences = None
+
+    matched = _matched_terms(highlight_terms, abstract, abstract_lower)
+    evidence = _best_sentence(abstract, matched, sentences=sentences)
+    html_ev = _highlight_html(evidence, matched)
+
+    it2 = dict(it)
+    it2["explain"] = {
+        "matched_terms": matched,
+        "abstract_html": html_ev,
+    }
+
+    # skor sudah diformat di sini, render loop tinggal tempel string
+    it2["_score_fmt"], it2["_score2_fmt"] = _format_scores(it)
+
+    # fallback fields (biar UI konsisten)
+    if doc.get("judul") and not it2.get("judul"):
+        it2["judul"] = doc.get("judul")
+    if doc.get("tanggal") and not it2.get("tanggal"):
+        it2["tanggal"] = doc.get("tanggal")
+    if doc.get("url") and not it2.get("url"):
+        it2["url"] = doc.get("url")
+    if doc.get("source") and not it2.get("source"):
+        it2["source"] = doc.get("source")
+
+    return it2
+
+
 def _attach_explain(
     results: List[Dict[str, Any]],
     highlight_terms: List[str],
@@ -332,34 +387,11 @@ def _attach_explain(
     docs_by_url: Dict[str, Dict[str, Any]],
     doc_id_by_doc_idx: Dict[int, str],
 ) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    for it in results:
-        doc = _lookup_full_doc(it, docs_by_id, docs_by_url, doc_id_by_doc_idx)
-        abstract = (doc.get("abstrak") or doc.get("abstract") or it.get("abstrak") or it.get("abstract") or "")
-        abstract = str(abstract)
-
-        matched = _matched_terms(highlight_terms, abstract)
-        evidence = _best_sentence(abstract, matched)
-        html_ev = _highlight_html(evidence, matched)
-
-        it2 = dict(it)
-        it2["explain"] = {
-            "matched_terms": matched,
-            "abstract_html": html_ev,
-        }
-
-        # fallback fields (biar UI konsisten)
-        if doc.get("judul") and not it2.get("judul"):
-            it2["judul"] = doc.get("judul")
-        if doc.get("tanggal") and not it2.get("tanggal"):
-            it2["tanggal"] = doc.get("tanggal")
-        if doc.get("url") and not it2.get("url"):
-            it2["url"] = doc.get("url")
-        if doc.get("source") and not it2.get("source"):
-            it2["source"] = doc.get("source")
-
-        out.append(it2)
-    return out
+    # per item independen; sengaja serial (kerjanya pure Python, thread pool cuma nambah overhead GIL)
+    return [
+        _explain_one(it, highlight_terms, docs_by_id, docs_by_url, doc_id_by_doc_idx)
+        for it in results
+    ]
 
 
 # =========================
@@ -380,21 +412,39 @@ def load_assets() -> Dict[str, Any]:
     settings = load_settings(paths_cfg)
 
     # stopwords
+    # frozenset (dari load_stopwords): read-only selama app jalan, dipakai bareng semua session
     stopwords = load_stopwords(
         paths.stopwords_file,
         use_sastrawi=settings.use_sastrawi_stopwords,
         use_domain=settings.use_domain_stopwords,
     )
 
-    # docs
-    docs_processed = read_jsonl(paths.processed_jsonl)
-    docs_by_id = {str(d.get("doc_id")): d for d in docs_processed if d.get("doc_id") is not None}
-    docs_by_url = {str(d.get("url")): d for d in docs_processed if d.get("url")}
+    # docs (streamed: langsung masuk ke map, tanpa list perantara)
+    docs_by_id: Dict[str, Dict[str, Any]] = {}
+    docs_by_url: Dict[str, Dict[str, Any]] = {}
+    first_doc: Optional[Dict[str, Any]] = None
+    for d in iter_jsonl(paths.processed_jsonl):
+        if first_doc is None:
+            first_doc = d
+        # intern token: string sama dipakai bareng antar dokumen (hemat RAM, `in` cek pointer dulu);
+        # tuple karena read-only selama app jalan
+        d["tokens"] = tuple(sys.intern(t) for t in (d.get("tokens") or []) if t)
+        # filter kandidat ekspansi yang nggak tergantung query, sekali per dokumen
+        d["_expand_tokens"] = expansion_candidates(d["tokens"])
+        # lowercase abstrak sekali per dokumen, bukan per hit per query
+        abstrak = str(d.get("abstrak") or d.get("abstract") or "")
+        d["_abstrak_lower"] = abstrak.lower()
+        # split kalimat evidence sekali per dokumen juga
+        d["_sentences"] = _split_sentences(abstrak)
+        if d.get("doc_id") is not None:
+            docs_by_id[str(d.get("doc_id"))] = d
+        if d.get("url"):
+            docs_by_url[str(d.get("url"))] = d
 
     # detect stemming_mode from processed docs if present
     stem_mode = settings.stemming_mode
-    if docs_processed:
-        m = docs_processed[0].get("stemming_mode")
+    if first_doc is not None:
+        m = first_doc.get("stemming_mode")
         if isinstance(m, str) and m.strip():
             stem_mode = m.strip().lower()
 
@@ -410,13 +460,11 @@ def load_assets() -> Dict[str, Any]:
             pass
 
         # map doc_idx -> doc_id (from docs_meta)
-        try:
-            for i, meta in enumerate(getattr(bm25, "docs_meta", []) or []):
-                did = meta.get("doc_id") if isinstance(meta, dict) else None
-                if did is not None:
-                    doc_id_by_doc_idx[int(i)] = str(did)
-        except Exception:
-            doc_id_by_doc_idx = {}
+        doc_id_by_doc_idx = {
+            i: str(meta["doc_id"])
+            for i, meta in enumerate(getattr(bm25, "docs_meta", []) or [])
+            if isinstance(meta, dict) and meta.get("doc_id") is not None
+        }
 
     # supervisor profiles
     sup_profiles = None
@@ -436,6 +484,25 @@ def load_assets() -> Dict[str, Any]:
     }
 
 
+# =========================
+# Query preprocessing (cached per query)
+# =========================
+# cache_data biar tetap kepake walau script di-rerun tiap interaksi UI
+@st.cache_data(show_spinner=False, max_entries=4096)
+def _preprocess_cached(query: str, stem_mode: str, stopwords_key: int) -> Tuple[str, ...]:
+    # stopwords_key = id(stopwords) dari load_assets, biar cache ikut ganti kalau assets di-reload
+    stopwords = load_assets()["stopwords"]
+    return tuple(preprocess_text(query, stopwords, stem_mode=stem_mode))
+
+
+def tokens_for_query(query: str) -> List[str]:
+    A = load_assets()
+    # normalisasi key: tokenize() sudah lowercase + split per kata, jadi "IHSG " == "ihsg"
+    query_norm = " ".join(query.lower().split())
+    # cache_data balikin salinan, jadi intern di sini biar cocok sama token dokumen
+    return [sys.intern(t) for t in _preprocess_cached(query_norm, A["stem_mode"], id(A["stopwords"]))]
+
+
 # =========================
 # Utility helpers
 # =========================
@@ -502,7 +569,8 @@ def auto_cutoff_by_score(items: List[Dict[str, Any]], max_keep: int = 30) -> Tup
     top_window = ranked[: min(len(ranked), max_keep)]
     scores = [float(x.get("score", 0.0)) for x in top_window]
 
-    s_sorted = sorted(scores)
+    # ranked sudah urut skor menurun -> urutan naik cukup dibalik, tanpa sort ulang
+    s_sorted = scores[::-1]
     mid = len(s_sorted) // 2
     median = s_sorted[mid] if len(s_sorted) % 2 else (s_sorted[mid - 1] + s_sorted[mid]) / 2.0
     abs_dev = [abs(s - median) for s in scores]
@@ -525,30 +593,17 @@ def auto_cutoff_by_score(items: List[Dict[str, Any]], max_keep: int = 30) -> Tup
 # =========================
 # Recommendation runners (local)
 # =========================
-def run_citations_local(query: str, topk: int = 80) -> List[Dict[str, Any]]:
+# cache TTL pendek: klik "Cari" berulang utk query yg sama nggak ngulang BM25 + ekspansi
+@st.cache_data(show_spinner=False, ttl=30, max_entries=1024)
+def _retrieve_citations_cached(q_tokens: Tuple[str, ...], topk: int, bm25_key: int) -> List[Dict[str, Any]]:
+    # bm25_key = id(bm25) dari load_assets, biar cache ikut ganti kalau index di-reload
     A = load_assets()
     bm25 = A["bm25"]
-    if bm25 is None:
-        st.error("BM25 index belum ada. Jalankan pipeline indexing dulu sampai file indexes/bm25/index.pkl kebentuk.")
-        return []
-
-    stopwords = A["stopwords"]
-    stem_mode = A["stem_mode"]
-
-    # tokens for retrieval
-    q_tokens = preprocess_text(query, stopwords, stem_mode=stem_mode)
-
-    # terms for highlight: pakai token query asli (tanpa stemming agresif) biar kayak 'IHSG' kebaca
-    raw_terms = [w for w in _WORD_RE.findall(query) if len(w) >= 2]
-    raw_terms_lower = []
-    for w in raw_terms:
-        wl = w.lower()
-        if wl in stopwords:
-            continue
-        raw_terms_lower.append(w)
+    q_tokens = list(q_tokens)
 
     # initial retrieve for expansion (lebih banyak dulu)
-    initial = bm25_search(bm25, q_tokens, top_k=max(25, topk * 3), include_meta=True)
+    initial_k = max(25, topk * 3)
+    initial = bm25_search(bm25, q_tokens, top_k=initial_k, include_meta=True)
 
     # query expansion from top docs (nambah konteks tanpa jadi ngaco)
     try:
@@ -563,21 +618,51 @@ def run_citations_local(query: str, topk: int = 80) -> List[Dict[str, Any]]:
     except Exception:
         q_tokens2 = q_tokens
 
+    # ekspansi nggak nambah apa-apa: ranking initial sudah sama persis, skip BM25 kedua.
+    # aman kalau initial sudah lengkap (< initial_k hit) atau sudah sedalam candidate pool recommend
+    reuse = None
+    if tuple(q_tokens2) == tuple(q_tokens) and (len(initial) < initial_k or initial_k >= max(30, topk * 5)):
+        reuse = initial
+
     # final recommend
-    results = recommend_citations(
+    return recommend_citations(
         bm25,
         q_tokens2,
         top_k=topk,
         diversify=True,
         original_query_tokens=q_tokens,
+        hits=reuse,
     )
 
+
+def run_citations_local(query: str, topk: int = 80, q_tokens: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    A = load_assets()
+    bm25 = A["bm25"]
+    if bm25 is None:
+        st.error("BM25 index belum ada. Jalankan pipeline indexing dulu sampai file indexes/bm25/index.pkl kebentuk.")
+        return []
+
+    stopwords = A["stopwords"]
+
+    # tokens for retrieval (reuse kalau caller sudah preprocess)
+    if q_tokens is None:
+        q_tokens = tokens_for_query(query)
+
+    # terms for highlight: pakai token query asli (tanpa stemming agresif) biar kayak 'IHSG' kebaca
+    # satu pass: filter panjang + stopwords langsung dari iterator regex
+    raw_terms_lower = [
+        w for w in (m.group(0) for m in _WORD_RE.finditer(query))
+        if len(w) >= 2 and w.lower() not in stopwords
+    ]
+
+    # retrieve + expand + recommend (cache TTL pendek, key = token query)
+    results = _retrieve_citations_cached(tuple(q_tokens), topk, id(bm25))
+
     # explain + highlight
-    highlight_terms = []
-    for t in (raw_terms_lower + (q_tokens or [])):
-        tt = str(t).strip()
-        if tt and tt not in highlight_terms:
-            highlight_terms.append(tt)
+    highlight_terms = [
+        tt for tt in dict.fromkeys(str(t).strip() for t in chain(raw_terms_lower, q_tokens or ()))
+        if tt
+    ]
 
     results = _attach_explain(
         results,
@@ -590,19 +675,25 @@ def run_citations_local(query: str, topk: int = 80) -> List[Dict[str, Any]]:
     return results
 
 
-def run_dosbing_local(query: str, topk: int = 10) -> List[Dict[str, Any]]:
+@st.cache_data(show_spinner=False, ttl=30, max_entries=1024)
+def _recommend_supervisors_cached(q_tokens: Tuple[str, ...], topk: int, profiles_key: int) -> List[Dict[str, Any]]:
+    # profiles_key = id(sup_profiles) dari load_assets, biar cache ikut ganti kalau profiles di-reload
+    return recommend_supervisors(load_assets()["sup_profiles"], list(q_tokens), top_k=topk)
+
+
+def run_dosbing_local(query: str, topk: int = 10, q_tokens: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     A = load_assets()
     sup_profiles = A["sup_profiles"]
     if not sup_profiles:
         st.error("Supervisor profiles belum ada. Jalankan pipeline profiling supaya data/processed/profiles/supervisors.json kebentuk.")
         return []
 
-    stopwords = A["stopwords"]
-    stem_mode = A["stem_mode"]
-    q_tokens = preprocess_text(query, stopwords, stem_mode=stem_mode)
+    if q_tokens is None:
+        q_tokens = tokens_for_query(query)
 
     try:
-        return recommend_supervisors(sup_profiles, q_tokens, top_k=topk)
+        # exception nggak ikut di-cache, jadi error tetap muncul tiap kali
+        return _recommend_supervisors_cached(tuple(q_tokens), topk, id(sup_profiles))
     except Exception as e:
         st.error(f"Gagal rekomendasi dosbing: {e}")
         return []
@@ -658,11 +749,14 @@ if run and q.strip():
         dosbing_res: List[Dict[str, Any]] = []
         sitasi_res: List[Dict[str, Any]] = []
 
+        # preprocess sekali, dipakai dosbing + sitasi
+        q_tokens = tokens_for_query(q)
+
         if show_dosbing:
-            dosbing_res = run_dosbing_local(q, topk=10)
+            dosbing_res = run_dosbing_local(q, topk=10, q_tokens=q_tokens)
 
         if show_sitasi:
-            sitasi_res = run_citations_local(q, topk=80)
+            sitasi_res = run_citations_local(q, topk=80, q_tokens=q_tokens)
 
         st.session_state["results"] = {"dosbing": dosbing_res, "sitasi": sitasi_res}
         st.session_state["cutoff_info"] = {"thr": None}
@@ -706,6 +800,8 @@ if show_dosbing:
     if not dosbing and q.strip():
         st.markdown('<div class="muted">Tidak ada dosbing yang cocok.</div>', unsafe_allow_html=True)
 
+    # kartu dosbing tanpa widget -> kumpulkan semua, kirim sebagai satu elemen markdown
+    cards: List[str] = []
     for item in dosbing:
         dosen = html.escape(item.get("dosen", "(Tanpa nama)"))
         score = float(item.get("score", 0.0))
@@ -724,21 +820,16 @@ if show_dosbing:
                 j = html.escape(s.get("judul") or s.get("doc_id") or "Publikasi")
                 u = s.get("url")
                 tg = s.get("tanggal")
-                if u:
-                    li = f'<li><a href="{html.escape(u)}" target="_blank" rel="noreferrer">{j}</a>'
-                else:
-                    li = f"<li>{j}"
-                if tg:
-                    li += f' <span class="small">• {html.escape(str(tg))}</span>'
-                li += "</li>"
-                lis.append(li)
+                link = f'<a href="{html.escape(u)}" target="_blank" rel="noreferrer">{j}</a>' if u else j
+                date = f' <span class="small">• {html.escape(str(tg))}</span>' if tg else ""
+                lis.append(f"<li>{link}{date}</li>")
             sample_html = (
                 '<div class="hr"></div>'
                 '<div class="small" style="margin-bottom:6px;">Contoh publikasi dosen:</div>'
                 f'<ul style="margin:0; padding-left:18px; font-size:13px;">{"".join(lis)}</ul>'
             )
 
-        st.markdown(
+        cards.append(
             f"""
             <div class="card">
               <div style="display:flex; justify-content:space-between; gap:12px;">
@@ -754,10 +845,12 @@ if show_dosbing:
 
               {sample_html}
             </div>
-            """,
-            unsafe_allow_html=True,
+            """
         )
 
+    if cards:
+        st.markdown("".join(cards), unsafe_allow_html=True)
+
 
 # =========================
 # Render Sitasi
@@ -781,8 +874,12 @@ if show_sitasi:
         judul_raw = item.get("judul") or "(Tanpa judul)"
         judul = html.escape(judul_raw)
         url = (item.get("url") or "").strip()
-        score = float(item.get("score", 0.0))
-        score2 = item.get("score2", None)
+        # biasanya sudah diformat di _explain_one; item lama di session_state bisa belum punya
+        score_fmt = item.get("_score_fmt")
+        if score_fmt is None:
+            score_fmt, score2_fmt = _format_scores(item)
+        else:
+            score2_fmt = item.get("_score2_fmt", "")
         tanggal = item.get("tanggal", None)
         source = item.get("source", None)
 
@@ -797,49 +894,54 @@ if show_sitasi:
 
         chips = "".join([f'<span class="pill">{html.escape(str(t))}</span>' for t in matched_terms[:10]])
 
-        # Share text
-        share_text = f"{judul_raw}"
-        if tanggal:
-            share_text += f" ({str(tanggal)[:4]})"
-        if url:
-            share_text += f"\n{url}"
-        wa_url = wa_share_url(share_text)
+        # Share text (link WA disimpan di item hasil, rerun berikutnya nggak quote ulang)
+        wa_url = item.get("_wa_url")
+        if wa_url is None:
+            share_text = f"{judul_raw}"
+            if tanggal:
+                share_text += f" ({str(tanggal)[:4]})"
+            if url:
+                share_text += f"\n{url}"
+            wa_url = item["_wa_url"] = wa_share_url(share_text)
 
         # Citations
         apa = format_citation_apa(item)
         ieee = format_citation_ieee(item)
 
-        title_html = (
-            f'<div style="font-size:16px; font-weight:900; line-height:1.25;">'
-            + (f'<a href="{html.escape(url)}" target="_blank" rel="noreferrer">{judul}</a>' if url else judul)
-            + "</div>"
-        )
-
-        meta_html = (
-            f'<div class="small" style="margin-top:8px; line-height:1.6;">'
-            f'<span class="kbd">score</span> {score:.4f} '
-            + (f'<span class="kbd">score2</span> {float(score2):.4f} ' if isinstance(score2, (float,int)) else "")
-            + (f"• {html.escape(str(tanggal))} " if tanggal else "")
-            + (f"• {html.escape(str(source))} " if source else "")
-            + "</div>"
-        )
-
-        abstrak_html = (
-            '<div class="hr"></div>'
-            '<div class="small">Abstrak (evidence):</div>'
-            f'<div class="abstract-evidence">{abs_html}</div>'
-        )
-
+        # card HTML dikumpulkan sebagai fragmen lalu di-join sekali (tanpa += string berulang)
+        parts = [
+            '<div class="card">',
+            # title
+            '<div style="font-size:16px; font-weight:900; line-height:1.25;">',
+            f'<a href="{html.escape(url)}" target="_blank" rel="noreferrer">{judul}</a>' if url else judul,
+            "</div>",
+            # meta
+            '<div class="small" style="margin-top:8px; line-height:1.6;">',
+            f'<span class="kbd">score</span> {score_fmt} ',
+        ]
+        if score2_fmt:
+            parts.append(f'<span class="kbd">score2</span> {score2_fmt} ')
+        if tanggal:
+            parts.append(f"• {html.escape(str(tanggal))} ")
+        if source:
+            parts.append(f"• {html.escape(str(source))} ")
+        parts += [
+            "</div>",
+            # abstrak (evidence)
+            '<div class="hr"></div>',
+            '<div class="small">Abstrak (evidence):</div>',
+            f'<div class="abstract-evidence">{abs_html}</div>',
+        ]
         if chips:
-            abstrak_html += (
-                "<div style='margin-top:10px;'>"
-                "<div class='small'>Cocok dengan:</div>"
-                f"{chips}"
-                "</div>"
-            )
+            parts += [
+                "<div style='margin-top:10px;'>",
+                "<div class='small'>Cocok dengan:</div>",
+                chips,
+                "</div>",
+            ]
 
         # open card (close after action row)
-        st.markdown(f'<div class="card">{title_html}{meta_html}{abstrak_html}', unsafe_allow_html=True)
+        st.markdown("".join(parts), unsafe_allow_html=True)
 
         # Action row: WhatsApp + Copy APA/IEEE (one line)
         st.markdown('<div class="btnRowInline">', unsafe_allow_html=True)